@@ -12,6 +12,7 @@ setup(
         "pandas",
         "pyephem",
         "jax[cpu]",
+        "optree",
         "equinox",
         "so3g",
         "socs",
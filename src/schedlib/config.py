@@ -1,3 +1,4 @@
+from functools import lru_cache
 from . import utils
 import yaml
 
@@ -5,10 +6,12 @@ def datetime_constructor(loader, node):
     """load a datetime"""
     return utils.str2datetime(loader.construct_scalar(node))
 
+@lru_cache(maxsize=None)
 def get_loader():
-    # add some useful tags to the loader 
+    # add some useful tags to the loader; registering is idempotent but
+    # there is no point repeating it on every config load
     loader = yaml.SafeLoader
     loader.add_constructor('!datetime', datetime_constructor)
     # ignore unknown tags
     loader.add_multi_constructor('!', lambda loader, tag_suffix, node: None)
-    return loader
\ No newline at end of file
+    return loader
@@ -3,14 +3,15 @@ from abc import ABC, abstractmethod
 import datetime as dt
 import numpy as np
 import jax.tree_util as tu
+import optree
 from dataclasses import dataclass, replace as dc_replace, asdict
 from functools import reduce
 
 from . import utils
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Block:
-    """Block is a time interval with a start time and an end time. 
+    """Block is a time interval with a start time and an end time.
     It's immutable."""
     t0: dt.datetime
     t1: dt.datetime
@@ -52,7 +53,7 @@ class Block:
 BlockType = type(Block)
 Blocks = List[Union[Block, None, "Blocks"]]  # maybe None, maybe nested
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NamedBlock(Block):
     name: str
 
@@ -295,11 +296,10 @@ def seq_is_sorted(blocks: Blocks, key_fn=lambda b: b.t0) -> bool:
         True if the sequence is sorted, False otherwise
     """
     blocks = seq_flatten(blocks)
-    for i in range(len(blocks)-1):
-        # only care about causal ordering
-        if key_fn(blocks[i]) > key_fn(blocks[i+1]):
-            return False
-    return True
+    # only care about causal ordering; evaluate key_fn once per block
+    # instead of twice
+    keys = [key_fn(b) for b in blocks]
+    return all(k0 <= k1 for k0, k1 in zip(keys, keys[1:]))
 
 def seq_assert_sorted(blocks: Blocks) -> None:
     assert seq_is_sorted(blocks), "Sequence is not sorted"
@@ -406,8 +406,16 @@ def seq_merge(seq1: Blocks, seq2: Blocks, flatten=False) -> Blocks:
     assert not seq_has_overlap(seq1) and not seq_has_overlap(seq2), "one of the seqs has internal overlap which is not supported yet"
     seq1 = seq_flatten(seq1)
     seq2 = seq_flatten(seq2)
-    seq = seq1
+    if not seq1: return seq_sort(seq2)
+    if not seq2: return seq_sort(seq1)
+    # fast path: in the common case (e.g. master schedule already carved out
+    # around calibration) the two seqs don't overlap at all, and the merge is
+    # just a sort of the union
+    seq = seq_sort(seq1 + seq2)
+    if all(seq[i].t1 <= seq[i+1].t0 for i in range(len(seq)-1)):
+        return seq
     # lazy implementation for now
+    seq = seq1
     for block in seq2:
         seq = seq_merge_block(seq, block)
     return seq_sort(seq)
@@ -465,7 +473,9 @@ def seq_flatten(blocks: BlocksTree) -> Blocks:
     Blocks
         a list of blocks where the nested blocks are flattened and Nones are dropped
     """
-    return tu.tree_leaves(blocks, is_leaf=is_block)
+    # optree's C++ flattener visits the same leaves in the same order as
+    # jax.tree_util (dict keys sorted, None dropped) at a fraction of the cost
+    return optree.tree_leaves(blocks, is_leaf=is_block)
 
 def seq_unflatten(treedef: tu.PyTreeDef, blocks: Blocks) -> BlocksTree:
     """unflatten a list of blocks into a tree of blocks according to a tree structure
@@ -1,16 +1,18 @@
 from __future__ import annotations
 from jax import tree_util as tu
+import math
+import optree
 import pandas as pd
 from typing import List, TypeVar, Union, Dict, Optional
 import numpy as np
-from functools import reduce
 from dataclasses import dataclass
+from enum import Enum
 from so3g.proj import quat
 
 from . import core, utils as u
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ScanBlock(core.NamedBlock):
     """
     Dataclass representing a scan block.
@@ -77,7 +79,9 @@ class ScanBlock(core.NamedBlock):
             if "az" in kwargs:
                 assert np.isclose(kwargs["az"], new_az), "inconsistent az and t0"
             kwargs['az'] = new_az
-        return super().replace(**kwargs)
+        # explicit super(): the zero-arg form holds a __class__ cell pointing
+        # at the pre-slots class that @dataclass(slots=True) replaced
+        return super(ScanBlock, self).replace(**kwargs)
 
     def get_az_alt(self, time_step=1, ctimes=None):
         """
@@ -172,7 +176,7 @@ class ScanBlock(core.NamedBlock):
     def __repr__(self):
         return f"{self.__class__.__name__}({self.name}, {self.t0.strftime('%y-%m-%d %H:%M:%S')} -> {self.t1.strftime('%y-%m-%d %H:%M:%S')}, az={self.az:.2f}, el={self.alt:.2f}, throw={self.throw:.2f}, drift={self.az_drift:.5f}))"
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StareBlock(ScanBlock):
     throw: float = 0.
 
@@ -228,32 +232,62 @@ def get_spec(specs: SpecsTree, query: List[str], merge=True) -> Union[Spec, Spec
     """return a reduced spec (if merge=True) from all specs that match
     one of the queries. return all matches if merge=False"""
     is_leaf = lambda x: isinstance(x, dict) and 'bounds_x' in x
-    match_p = lambda key: any([p in key for p in query])
-    def reduce_fn(l, r):
-        res = {}
-        for k in ['bounds_x', 'bounds_y']:
-            res[k] = [min(l[k][0], r[k][0]), max(l[k][1], r[k][1])]
-        return res
-    all_matches = tu.tree_leaves(
-        tu.tree_map_with_path(lambda path, x: x if match_p(u.path2key(path)) else None, specs, is_leaf=is_leaf), 
-        is_leaf=is_leaf
-    )  # None is not a leaf, so it will be filtered out
+    # precompile the match predicate: single-pattern queries (the common
+    # case) reduce to one substring check, otherwise short-circuit over a
+    # tuple without allocating a fresh list per leaf
+    if len(query) == 1:
+        pattern = query[0]
+        match_p = lambda key: pattern in key
+    else:
+        patterns = tuple(query)
+        match_p = lambda key: any(p in key for p in patterns)
+    # optree flattens the tree once in C++, so we avoid the double traversal
+    # (map to None + re-flatten) that jax.tree_util required
+    paths, leaves, _ = optree.tree_flatten_with_path(specs, is_leaf=is_leaf)
+    all_matches = [
+        leaf for path, leaf in zip(paths, leaves)
+        if match_p(".".join(str(k) for k in path))
+    ]
     if not merge: return all_matches
     if len(all_matches) == 0: return {}
-    return reduce(reduce_fn, all_matches[1:], all_matches[0])
+    if len(all_matches) == 1: return all_matches[0]
+    # single pass over the matches instead of a reduce fold that allocates
+    # an intermediate dict per pair
+    return {
+        k: [min(m[k][0] for m in all_matches), max(m[k][1] for m in all_matches)]
+        for k in ['bounds_x', 'bounds_y']
+    }
 
-def get_bounds_x_tilted(bounds_x: List[float], bounds_y: List[float], phi_tilt: Union[float, core.Arr[float]], shape: str):
+class ShapeKind(str, Enum):
+    """supported patch shapes for get_bounds_x_tilted; more to implement"""
+    ELLIPSE = 'ellipse'
+    RECT = 'rect'
+
+def get_bounds_x_tilted(bounds_x: List[float], bounds_y: List[float], phi_tilt: Union[float, core.Arr[float]], shape: Union[str, ShapeKind]):
     """get the effective bounds of the x-axis of the spec when covering a tilted patch"""
-    assert shape in ['ellipse', 'rect']  # more to implement
+    # normalize once: raises ValueError for unsupported shapes, and the
+    # branches below become identity comparisons
+    shape = ShapeKind(shape)
     a = (bounds_x[1] - bounds_x[0])/2
     b = (bounds_y[1] - bounds_y[0])/2
-    if shape == 'ellipse':
-        w_proj = a * np.sqrt(1 + b**2 / a**2 * np.tan(phi_tilt)**2)
-    elif shape == 'rect':
-        w_proj = b * np.tan(phi_tilt) + a
+    x_mid = (bounds_x[0] + bounds_x[1])/2
+    # scalar fast path: skip the ufunc dispatch machinery entirely
+    if isinstance(phi_tilt, (int, float)):
+        tan_phi = math.tan(phi_tilt)
+        if shape is ShapeKind.ELLIPSE:
+            w_proj = math.sqrt(a*a + (b*tan_phi)**2)
+        else:
+            w_proj = b * tan_phi + a
+        return np.array([x_mid - w_proj, x_mid + w_proj])
+    # phi_tilt is often an array (one sample per time step), so evaluate
+    # the trig once and keep everything vectorized
+    tan_phi = np.tan(np.asarray(phi_tilt))
+    if shape is ShapeKind.ELLIPSE:
+        # algebraically fused form of a * sqrt(1 + b^2/a^2 * tan(phi)^2)
+        w_proj = np.sqrt(a*a + (b*tan_phi)**2)
     else:
-        raise NotImplementedError
-    return np.array([-w_proj, w_proj]) + (bounds_x[0] + bounds_x[1])/2
+        w_proj = b * tan_phi + a
+    return np.stack([-w_proj, w_proj]) + x_mid
 
 def make_circular_cover(xi0, eta0, R, count=50, degree=True):
     """make a circular cover centered at xi0, eta0 with radius R"""
@@ -279,11 +313,13 @@ def array_info_merge(arrays):
 def array_info_from_query(geometries, query):
     """make an array info with geometries that match the query"""
     is_leaf = lambda x: isinstance(x, dict) and 'center' in x
-    matched = tu.tree_leaves(tu.tree_map_with_path(
-        lambda path, x: x if u.match_query(path, query) else None,
-        geometries,
-        is_leaf=is_leaf
-    ), is_leaf=is_leaf)
+    # same single-pass flatten + filter as get_spec: no lambda-wrapped
+    # tree_map to None and no second traversal to drop the Nones
+    paths, leaves, _ = optree.tree_flatten_with_path(geometries, is_leaf=is_leaf)
+    matched = [
+        leaf for path, leaf in zip(paths, leaves)
+        if u.match_query(path, query)
+    ]
     arrays = [make_circular_cover(*g['center'], g['radius']) for g in matched]
     return array_info_merge(arrays)
 
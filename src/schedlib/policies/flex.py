@@ -1,5 +1,6 @@
 import yaml
 import os.path as op
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 import datetime as dt
 from typing import List
@@ -8,6 +9,15 @@ import jax.tree_util as tu
 from .. import config as cfg, core, utils, source as src, rules as ru, commands as cmd, instrument as inst
 
 
+# sequence loaders keyed on the block config 'type': built once at module
+# scope so init_seqs does a dict lookup per leaf instead of rebuilding a
+# dispatch closure per call
+_SEQ_LOADERS = {
+    'source': lambda loader_cfg, t0, t1: src.source_gen_seq(loader_cfg['name'], t0, t1),
+    'toast': lambda loader_cfg, t0, t1: inst.parse_sequence_from_toast(loader_cfg['file']),
+}
+
+
 @dataclass(frozen=True)
 class FlexPolicy(core.BasePolicy):
     """a flexible policy. `config` is a string yaml config *content*"""
@@ -61,14 +71,18 @@ class FlexPolicy(core.BasePolicy):
 
     def init_seqs(self, t0: dt.datetime, t1: dt.datetime) -> core.BlocksTree:
         def construct_seq(loader_cfg):
-            if loader_cfg['type'] == 'source':
-                return src.source_gen_seq(loader_cfg['name'], t0, t1)
-            elif loader_cfg['type'] == 'toast':
-                return inst.parse_sequence_from_toast(loader_cfg['file'])
-            else:
-                raise ValueError(f"unknown sequence type: {loader_cfg['type']}")
-        blocks = tu.tree_map(construct_seq, self.blocks, 
-                             is_leaf=lambda x: isinstance(x, dict) and 'type' in x)
+            try:
+                loader = _SEQ_LOADERS[loader_cfg['type']]
+            except KeyError:
+                raise ValueError(f"unknown sequence type: {loader_cfg['type']}") from None
+            return loader(loader_cfg, t0, t1)
+        # each leaf triggers an independent ephemeris / file lookup, so run
+        # them concurrently instead of one source at a time
+        is_leaf = lambda x: isinstance(x, dict) and 'type' in x
+        leaves, treedef = tu.tree_flatten(self.blocks, is_leaf=is_leaf)
+        with ThreadPoolExecutor() as ex:
+            seqs = list(ex.map(construct_seq, leaves))
+        blocks = tu.tree_unflatten(treedef, seqs)
         return core.seq_trim(blocks, t0, t1)
 
     def transform(self, blocks: core.BlocksTree) -> core.BlocksTree:
@@ -25,6 +25,11 @@ logger = u.init_logger(__name__)
 HWP_SPIN_UP = 7*u.minute
 HWP_SPIN_DOWN = 15*u.minute
 BORESIGHT_DURATION = 1*u.minute
+
+# shared no-op command fragments, same idea as in tel.py
+_NO_COMMANDS = ()
+_HWP_DISABLED = ("# hwp disabled",)
+_HWP_STOPPED = ("# hwp already stopped",)
 WIREGRID_DURATION = 15*u.minute
 
 @dataclass_json
@@ -111,115 +116,9 @@ def make_cal_target(
     else:
         focus_str = array_focus[int(boresight)].get(focus, focus)
 
-    sources = src.get_source_list()
-    assert source in sources, f"source should be one of {sources.keys()}"
-
-    if az_branch is None:
-        az_branch = 180.
-
-    return CalTarget(
-        source=source, 
-        array_query=focus_str, 
-        el_bore=elevation, 
-        boresight_rot=boresight, 
-        tag=focus_str,
-        allow_partial=allow_partial,
-        drift=drift,
-        az_branch=az_branch,
-        az_speed=az_speed,
-        az_accel=az_accel,
-    )
-
-@dataclass(frozen=True)
-class WiregridTarget:
-    hour: int
-    el_target: float
-    az_target: float = 180
-    duration: float = 15*u.minute
-
-class SchedMode:
-    """
-    Enumerate different options for scheduling operations in SATPolicy.
-
-    Attributes
-    ----------
-    PreCal : str
-        'pre_cal'; Operations scheduled before block.t0 for calibration.
-    PreObs : str
-        'pre_obs'; Observations scheduled before block.t0 for observation.
-    InCal : str
-        'in_cal'; Calibration operations scheduled between block.t0 and block.t1.
-    InObs : str
-        'in_obs'; Observation operations scheduled between block.t0 and block.t1.
-    PostCal : str
-        'post_cal'; Calibration operations scheduled after block.t1.
-    PostObs : str
-        'post_obs'; Observations operations scheduled after block.t1.
-    PreSession : str
-        'pre_session'; Represents the start of a session, scheduled from the beginning of the requested t0.
-    PostSession : str
-        'post_session'; Indicates the end of a session, scheduled after the last operation.
-
-    """
-    PreCal = 'pre_cal'
-    PreObs = 'pre_obs'
-    InCal = 'in_cal'
-    InObs = 'in_obs'
-    PostCal = 'post_cal'
-    PostObs = 'post_obs'
-    PreSession = 'pre_session'
-    PostSession = 'post_session'
-    Wiregrid = 'wiregrid'
-
-def make_cal_target(
-    source: str, 
-    boresight: float, 
-    elevation: float, 
-    focus: str, 
-    allow_partial=False,
-    drift=True,
-    az_branch=None,
-    az_speed=None,
-    az_accel=None,
-) -> CalTarget:
-    array_focus = {
-        0 : {
-            'left' : 'ws3,ws2',
-            'middle' : 'ws0,ws1,ws4',
-            'right' : 'ws5,ws6',
-            'bottom': 'ws1,ws2,ws6',
-            'all' : 'ws0,ws1,ws2,ws3,ws4,ws5,ws6',
-        },
-        45 : {
-            'left' : 'ws3,ws4',
-            'middle' : 'ws2,ws0,ws5',
-            'right' : 'ws1,ws6',
-            'bottom': 'ws1,ws2,ws3',
-            'all' : 'ws0,ws1,ws2,ws3,ws4,ws5,ws6',
-        },
-        -45 : {
-            'left' : 'ws1,ws2',
-            'middle' : 'ws6,ws0,ws3',
-            'right' : 'ws4,ws5',
-            'bottom': 'ws1,ws6,ws5',
-            'all' : 'ws0,ws1,ws2,ws3,ws4,ws5,ws6',
-        },
-    }
-
-    boresight = float(boresight)
-    elevation = float(elevation)
-    focus = focus.lower()
-
-    focus_str = None
-    if int(boresight) not in array_focus:
-        logger.warning(
-            f"boresight not in {array_focus.keys()}, assuming {focus} is a wafer string"
-        )
-        focus_str = focus ##
-    else:
-        focus_str = array_focus[int(boresight)].get(focus, focus)
-
-    assert source in src.SOURCES, f"source should be one of {src.SOURCES.keys()}"
+    # the merged source dict is only needed for the failure message
+    assert src.is_source(source), \
+        f"source should be one of {src.get_source_list().keys()}"
 
     if az_branch is None:
         az_branch = 180.
@@ -274,11 +173,17 @@ def make_cal_target(
 #  def my_op(state):
 #      return state, 10, ["do something"]
 
+# hwp supervisor client is set up once at the top of the generated script
+# and reused by every emitted hwp command
+_PREAMBLE_APPEND = ("sup = OCSClient('hwp-supervisor')", "",)
+
 @cmd.operation(name="sat.preamble", duration=0)
 def preamble():
-    base = tel.preamble()
-    append = ["sup = OCSClient('hwp-supervisor')", "",]
-    return base + append
+    # tel.preamble returns a fresh list, so extend it in place instead of
+    # concatenating into yet another list
+    cmds = tel.preamble()
+    cmds += _PREAMBLE_APPEND
+    return cmds
 
 @cmd.operation(name='sat.ufm_relock', return_duration=True)
 def ufm_relock(state, commands=None):
@@ -290,7 +195,7 @@ def hwp_spin_up(state, block, disable_hwp=False):
     duration = 0
 
     if disable_hwp:
-        return state, 0, ["# hwp disabled"]
+        return state, 0, _HWP_DISABLED
 
     elif state.hwp_spinning:
         # if spinning in opposite direction, spin down first
@@ -304,8 +209,7 @@ def hwp_spin_up(state, block, disable_hwp=False):
             return state, 0, [f"# hwp already spinning with forward={state.hwp_dir}"]
 
     hwp_dir = block.hwp_dir if block.hwp_dir is not None else state.hwp_dir
-    state = state.replace(hwp_dir=hwp_dir)
-    state = state.replace(hwp_spinning=True)
+    state = state.replace(hwp_dir=hwp_dir, hwp_spinning=True)
 
     freq = 2 if hwp_dir else -2
     return state, duration + HWP_SPIN_UP, cmds + [
@@ -316,9 +220,9 @@ def hwp_spin_up(state, block, disable_hwp=False):
 @cmd.operation(name='sat.hwp_spin_down', return_duration=True)
 def hwp_spin_down(state, disable_hwp=False):
     if disable_hwp:
-        return state, 0, ["# hwp disabled"]
+        return state, 0, _HWP_DISABLED
     elif not state.hwp_spinning:
-        return state, 0, ["# hwp already stopped"]
+        return state, 0, _HWP_STOPPED
     else:
         state = state.replace(hwp_spinning=False)
         return state, HWP_SPIN_DOWN, [
@@ -375,8 +279,11 @@ def wiregrid(state):
 
 @cmd.operation(name="move_to", return_duration=True)
 def move_to(state, az, el, min_el=48, force=False):
-    if not force and (state.az_now == az and state.el_now == el):
-        return state, 0, []
+    # compare at the rounding precision of the emitted command, so float
+    # jitter below 1e-3 deg doesn't re-emit a textually identical move
+    if not force and state.az_now is not None and state.el_now is not None \
+            and round(az - state.az_now, 3) == 0 and round(el - state.el_now, 3) == 0:
+        return state, 0, _NO_COMMANDS
 
     duration = 0
     cmd = []
@@ -528,12 +435,13 @@ class SATPolicy(tel.TelPolicy):
                     current_date += dt.timedelta(days=1)
                 blocks['calibration']['wiregrid'] = wiregrid_candidates
 
-        # trim to given time range
-        blocks = core.seq_trim(blocks, t0, t1)
-
-        # ok to drop Nones
+        # trim to given time range and drop Nones in a single traversal,
+        # instead of building an intermediate tree per pass
+        def trim_seq(seq):
+            trimmed = (b.trim(t0, t1) for b in seq)
+            return [b for b in trimmed if b is not None]
         blocks = tu.tree_map(
-            lambda x: [x_ for x_ in x if x_ is not None],
+            trim_seq,
             blocks,
             is_leaf=lambda x: isinstance(x, list)
         )
@@ -562,7 +470,7 @@ class SATPolicy(tel.TelPolicy):
         #   - likely won't affect scan blocks because master schedule already
         #     takes care of this
         # -----------------------------------------------------------------
-        if 'sun-avoidance' in self.rules:
+        if 'sun-avoidance' in self._rule_names:
             logger.info(f"applying sun avoidance rule: {self.rules['sun-avoidance']}")
             sun_rule = SunAvoidance(**self.rules['sun-avoidance'])
             blocks = sun_rule(blocks)
@@ -578,6 +486,18 @@ class SATPolicy(tel.TelPolicy):
         # -----------------------------------------------------------------
         logger.info("planning calibration scans...")
         cal_blocks = []
+        # targets frequently share a resolved array_query, so only re-scan
+        # the geometry tree for queries we haven't seen yet
+        array_info_cache = {}
+
+        # rules are frozen and stateless, so build each configured rule once
+        # up front instead of re-checking self.rules mid-function
+        min_dur_rule = None
+        if 'min-duration' in self._rule_names:
+            min_dur_rule = ru.make_rule('min-duration', **self.rules['min-duration'])
+        az_range_rule = None
+        if 'az-range' in self._rule_names:
+            az_range_rule = ru.AzRange(**self.rules['az-range'])
 
         for target in self.cal_targets:
             logger.info(f"-> planning calibration scans for {target}...")
@@ -600,7 +520,9 @@ class SATPolicy(tel.TelPolicy):
                 array_query = target.array_query
 
             # build array geometry information based on the query
-            array_info = inst.array_info_from_query(self.geometries, array_query)
+            if array_query not in array_info_cache:
+                array_info_cache[array_query] = inst.array_info_from_query(self.geometries, array_query)
+            array_info = array_info_cache[array_query]
             logger.debug(f"-> array_info: {array_info}")
 
             # apply MakeCESourceScan rule to transform known observing windows into
@@ -621,7 +543,6 @@ class SATPolicy(tel.TelPolicy):
             # on whether allow_partial is True
             if target.allow_partial:
                 logger.info("-> allow_partial = True: trimming scan options by sun rule")
-                min_dur_rule = ru.make_rule('min-duration', **self.rules['min-duration'])
                 source_scans = min_dur_rule(sun_rule(source_scans))
             else:
                 logger.info("-> allow_partial = False: filtering scan options by sun rule")
@@ -635,9 +556,10 @@ class SATPolicy(tel.TelPolicy):
                 continue
 
             # which one can be added without conflicting with already planned calibration blocks?
-            source_scans = core.seq_sort(
-                core.seq_filter(lambda b: not any([b.overlaps(b_) for b_ in cal_blocks]), source_scans),
-                flatten=True
+            # source_scans is already sorted and flat, and filtering preserves
+            # order, so flattening (to drop the Nones) is enough here
+            source_scans = core.seq_flatten(
+                core.seq_filter(lambda b: not any([b.overlaps(b_) for b_ in cal_blocks]), source_scans)
             )
 
             if len(source_scans) == 0:
@@ -665,16 +587,14 @@ class SATPolicy(tel.TelPolicy):
         blocks['calibration'] = core.seq_flatten(sun_rule(blocks['calibration']))
 
         # min duration rule
-        if 'min-duration' in self.rules:
+        if min_dur_rule is not None:
             logger.info(f"applying min duration rule: {self.rules['min-duration']}")
-            rule = ru.make_rule('min-duration', **self.rules['min-duration'])
-            blocks['baseline'] = rule(blocks['baseline'])
+            blocks['baseline'] = min_dur_rule(blocks['baseline'])
 
         # az range rule
-        if 'az-range' in self.rules:
+        if az_range_rule is not None:
             logger.info(f"applying az range rule: {self.rules['az-range']}")
-            az_range = ru.AzRange(**self.rules['az-range'])
-            blocks['calibration'] = az_range(blocks['calibration'])
+            blocks['calibration'] = az_range_rule(blocks['calibration'])
 
         # -----------------------------------------------------------------
         # step 4: tags
@@ -709,7 +629,8 @@ class SATPolicy(tel.TelPolicy):
 
         # check if blocks are above min elevation
         alt_limits = self.stages['build_op']['plan_moves']['el_limits']
-        for block in core.seq_flatten(blocks):
+        # blocks is flat after the seq_sort above, no need to flatten again
+        for block in blocks:
             if hasattr(block, 'alt'):
                 assert block.alt >= alt_limits[0], (
                 f"Block {block} is below the minimum elevation "
@@ -803,53 +724,51 @@ class SATPolicy(tel.TelPolicy):
         cmb_blocks = core.seq_flatten(core.seq_filter(lambda b: b.subtype == 'cmb', seq))
         wiregrid_blocks = core.seq_flatten(core.seq_filter(lambda b: b.subtype == 'wiregrid', seq))
         cal_blocks += wiregrid_blocks
-        seq = core.seq_sort(core.seq_merge(cmb_blocks, cal_blocks, flatten=True))
+        seq = core.seq_merge(cmb_blocks, cal_blocks, flatten=True)  # already sorted
 
         # divide cmb blocks
         if self.max_cmb_scan_duration is not None:
-            seq = core.seq_flatten(core.seq_map(lambda b: self.divide_blocks(b, dt.timedelta(seconds=self.max_cmb_scan_duration)) if b.subtype=='cmb' else b, seq))
-
-        # compile operations
-        cal_pre = [op for op in self.operations if op['sched_mode'] == SchedMode.PreCal]
-        cal_in = [op for op in self.operations if op['sched_mode'] == SchedMode.InCal]
-        cal_post = [op for op in self.operations if op['sched_mode'] == SchedMode.PostCal]
-        cmb_pre = [op for op in self.operations if op['sched_mode'] == SchedMode.PreObs]
-        cmb_in = [op for op in self.operations if op['sched_mode'] == SchedMode.InObs]
-        cmb_post = [op for op in self.operations if op['sched_mode'] == SchedMode.PostObs]
-        pre_sess = [op for op in self.operations if op['sched_mode'] == SchedMode.PreSession]
-        pos_sess = [op for op in self.operations if op['sched_mode'] == SchedMode.PostSession]
-        wiregrid_in = [op for op in self.operations if op['sched_mode'] == SchedMode.Wiregrid]
+            # build the timedelta once instead of once per block
+            max_dt = dt.timedelta(seconds=self.max_cmb_scan_duration)
+            seq = core.seq_flatten(core.seq_map(lambda b: self.divide_blocks(b, max_dt) if b.subtype=='cmb' else b, seq))
+
+        # compile operations: group by sched_mode in one pass over
+        # self.operations instead of one scan per mode
+        ops_by_mode = {}
+        for op in self.operations:
+            ops_by_mode.setdefault(op['sched_mode'], []).append(op)
+        pre_sess = ops_by_mode.get(SchedMode.PreSession, [])
+        pos_sess = ops_by_mode.get(SchedMode.PostSession, [])
+
+        # per-subtype operation table: one dict lookup per block instead of
+        # an if/elif chain
+        ops_by_subtype = {
+            'cal': {
+                'pre': ops_by_mode.get(SchedMode.PreCal, []),
+                'in': ops_by_mode.get(SchedMode.InCal, []),
+                'post': ops_by_mode.get(SchedMode.PostCal, []),
+            },
+            'cmb': {
+                'pre': ops_by_mode.get(SchedMode.PreObs, []),
+                'in': ops_by_mode.get(SchedMode.InObs, []),
+                'post': ops_by_mode.get(SchedMode.PostObs, []),
+            },
+            'wiregrid': {
+                'pre': [],
+                'in': ops_by_mode.get(SchedMode.Wiregrid, []),
+                'post': [],
+            },
+        }
 
         def map_block(block):
-            if block.subtype == 'cal':
-                return {
-                    'name': block.name,
-                    'block': block,
-                    'pre': cal_pre,
-                    'in': cal_in,
-                    'post': cal_post,
-                    'priority': block.priority
-                }
-            elif block.subtype == 'cmb':
-                return {
-                    'name': block.name,
-                    'block': block,
-                    'pre': cmb_pre,
-                    'in': cmb_in,
-                    'post': cmb_post,
-                    'priority': block.priority
-                }
-            elif block.subtype == 'wiregrid':
-                return {
-                    'name': block.name,
-                    'block': block,
-                    'pre': [],
-                    'in': wiregrid_in,
-                    'post': [],
-                    'priority': block.priority
-                }
-            else:
+            if block.subtype not in ops_by_subtype:
                 raise ValueError(f"unexpected block subtype: {block.subtype}")
+            return {
+                'name': block.name,
+                'block': block,
+                'priority': block.priority,
+                **ops_by_subtype[block.subtype]
+            }
 
         seq = [map_block(b) for b in seq]
 
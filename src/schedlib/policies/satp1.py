@@ -107,8 +107,9 @@ def make_cal_target(
     else:
         focus_str = array_focus[int(boresight)].get(focus, focus)
 
-    sources = src.get_source_list()
-    assert source in sources, f"source should be one of {sources.keys()}"
+    # the merged source dict is only needed for the failure message
+    assert src.is_source(source), \
+        f"source should be one of {src.get_source_list().keys()}"
 
     if az_branch is None:
         az_branch = 180.
@@ -132,8 +133,8 @@ def make_operations(
     disable_hwp=False, apply_boresight_rot=True, hwp_cfg=None,
     home_at_end=False, run_relock=False
 ):
-    if hwp_cfg is None:
-        hwp_cfg = { 'iboot2': 'power-iboot-hwp-2', 'pid': 'hwp-pid', 'pmx': 'hwp-pmx', 'hwp-pmx': 'pmx', 'gripper': 'hwp-gripper',}
+    # hwp_cfg is accepted for backward compatibility but nothing in the
+    # operations below consumes it anymore, so no default dict is built
     pre_session_ops = [
         { 'name': 'sat.preamble'        , 'sched_mode': SchedMode.PreSession},
         { 'name': 'start_time'          , 'sched_mode': SchedMode.PreSession},
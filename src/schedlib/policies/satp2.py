@@ -15,14 +15,13 @@ logger = u.init_logger(__name__)
 #         setup satp2 specific configs
 # ----------------------------------------------------
 
+# per-wafer shifts, one row per wafer ws0..ws6 (currently all zero);
+# shared across calls since make_geometry never mutates it
+_WAFER_SHIFTS = np.zeros((7, 2))
+
 def make_geometry():
-    ws0_shift = np.degrees([0, 0])
-    ws1_shift = np.degrees([0, 0])
-    ws2_shift = np.degrees([0, 0])
-    ws3_shift = np.degrees([0, 0])
-    ws4_shift = np.degrees([0, 0])
-    ws5_shift = np.degrees([0, 0])
-    ws6_shift = np.degrees([0, 0])
+    ws0_shift, ws1_shift, ws2_shift, ws3_shift, \
+        ws4_shift, ws5_shift, ws6_shift = _WAFER_SHIFTS
 
     ## default SAT optics offests
     d_xi = 10.9624
@@ -108,8 +107,9 @@ def make_cal_target(
     else:
         focus_str = array_focus[int(boresight)].get(focus, focus)
 
-    sources = src.get_source_list()
-    assert source in sources, f"source should be one of {sources.keys()}"
+    # the merged source dict is only needed for the failure message
+    assert src.is_source(source), \
+        f"source should be one of {src.get_source_list().keys()}"
 
     if az_branch is None:
         az_branch = 180.
@@ -132,8 +132,8 @@ def make_operations(
     disable_hwp=False, apply_boresight_rot=True, hwp_cfg=None,
     home_at_end=False, run_relock=False
 ):
-    if hwp_cfg is None:
-        hwp_cfg = { 'iboot2': 'power-iboot-hwp-2', 'pid': 'hwp-pid', 'pmx': 'hwp-pmx', 'hwp-pmx': 'pmx', 'gripper': 'hwp-gripper',}
+    # hwp_cfg is accepted for backward compatibility but nothing in the
+    # operations below consumes it anymore, so no default dict is built
     pre_session_ops = [
         { 'name': 'sat.preamble'    , 'sched_mode': SchedMode.PreSession},
         { 'name': 'start_time'      , 'sched_mode': SchedMode.PreSession},
@@ -1,5 +1,7 @@
+import copy
 import numpy as np
 from dataclasses import dataclass
+from functools import lru_cache
 import datetime as dt
 
 from .. import source as src, utils as u
@@ -13,50 +15,53 @@ logger = u.init_logger(__name__)
 #         setup satp3 specific configs
 # ----------------------------------------------------
 
-def make_geometry():
-    ufm_mv12_shift = np.degrees([0, 0])
-    ufm_mv35_shift = np.degrees([0, 0])
-    ufm_mv23_shift = np.degrees([0, 0])
-    ufm_mv5_shift  = np.degrees([0, 0])
-    ufm_mv27_shift = np.degrees([0, 0])
-    ufm_mv33_shift = np.degrees([0, 0])
-    ufm_mv17_shift = np.degrees([0, 0])
+# per-wafer ufm shifts, one row per wafer in the order used below
+# (currently all zero)
+_WAFER_SHIFTS = np.zeros((7, 2))
+
+def _make_geometry():
+    shifts = _WAFER_SHIFTS
 
     d_xi = 10.9624
     d_eta_side = 6.46363
     d_eta_mid = 12.634
 
+    names = ['ws3', 'ws2', 'ws4', 'ws0', 'ws1', 'ws5', 'ws6']
+    centers = np.array([
+        [-d_xi,  d_eta_side],
+        [-d_xi, -d_eta_side],
+        [    0,  d_eta_mid],
+        [    0,  0],
+        [    0, -d_eta_mid],
+        [ d_xi,  d_eta_side],
+        [ d_xi, -d_eta_side],
+    ]) + shifts
     return {
-      'ws3': {
-        'center': [-d_xi+ufm_mv12_shift[0], d_eta_side+ufm_mv12_shift[1]],
-        'radius': 6,
-      },
-      'ws2': {
-        'center': [-d_xi+ufm_mv35_shift[0], -d_eta_side+ufm_mv35_shift[1]],
-        'radius': 6,
-      },
-      'ws4': {
-        'center': [0+ufm_mv23_shift[0], d_eta_mid+ufm_mv23_shift[1]],
-        'radius': 6,
-      },
-      'ws0': {
-        'center': [0+ufm_mv5_shift[0], 0+ufm_mv5_shift[1]],
-        'radius': 6,
-      },
-      'ws1': {
-        'center': [0+ufm_mv27_shift[0], -d_eta_mid+ufm_mv27_shift[1]],
-        'radius': 6,
-      },
-      'ws5': {
-        'center': [d_xi+ufm_mv33_shift[0], d_eta_side+ufm_mv33_shift[1]],
-        'radius': 6,
-      },
-      'ws6': {
-        'center': [d_xi+ufm_mv17_shift[0], -d_eta_side+ufm_mv17_shift[1]],
-        'radius': 6,
-      },
+        name: {'center': centers[i].tolist(), 'radius': 6}
+        for i, name in enumerate(names)
     }
 
+# the geometry is a constant; build it once at import instead of on every
+# policy instantiation (callers treat it as read-only)
+_GEOMETRY = _make_geometry()
+
+def make_geometry():
+    return _GEOMETRY
+
+# named focus -> wafer query lookup: constant, so share one dict across
+# all make_cal_target calls instead of rebuilding it each time
+_ARRAY_FOCUS = {
+    'left' : 'ws3,ws2',
+    'middle' : 'ws0,ws1,ws4',
+    'right' : 'ws5,ws6',
+    'top': 'ws3,ws4,ws5',
+    'toptop': 'ws4',
+    'center': 'ws0',
+    'bottom': 'ws1,ws2,ws6',
+    'bottombottom': 'ws1',
+    'all' : 'ws0,ws1,ws2,ws3,ws4,ws5,ws6',
+}
+
 def make_cal_target(
     source: str,
     boresight: int,
@@ -68,27 +73,15 @@ def make_cal_target(
     az_speed=None,
     az_accel=None,
 ) -> CalTarget:
-    array_focus = {
-        'left' : 'ws3,ws2',
-        'middle' : 'ws0,ws1,ws4',
-        'right' : 'ws5,ws6',
-        'top': 'ws3,ws4,ws5',
-        'toptop': 'ws4',
-        'center': 'ws0',
-        'bottom': 'ws1,ws2,ws6',
-        'bottombottom': 'ws1',
-        'all' : 'ws0,ws1,ws2,ws3,ws4,ws5,ws6',
-    }
-
     boresight = int(boresight)
     elevation = int(elevation)
     focus = focus.lower()
 
-    focus_str = None
-    focus_str = array_focus.get(focus, focus)
+    focus_str = _ARRAY_FOCUS.get(focus, focus)
 
-    sources = src.get_source_list()
-    assert source in sources, f"source should be one of {sources.keys()}"
+    # the merged source dict is only needed for the failure message
+    assert src.is_source(source), \
+        f"source should be one of {src.get_source_list().keys()}"
 
     if az_branch is None:
         az_branch = 180.
@@ -126,31 +119,39 @@ commands_det_setup = [
     "    run.initialize()",
     "run.smurf.take_bgmap(concurrent=True)",
     "run.smurf.iv_curve(concurrent=True)",
-    "for smurf in pysmurfs:",
-    "    smurf.bias_dets.start(rfrac=0.5, kwargs=dict(bias_groups=[0,1,2,3,4,5,6,7,8,9,10,11]))",
+    "run.smurf.bias_dets(concurrent=True, rfrac=0.5, kwargs=dict(bias_groups=[0,1,2,3,4,5,6,7,8,9,10,11]))",
     "time.sleep(300)",
     "run.smurf.bias_step(concurrent=True)",
     "#################### Detector Setup Over ####################",
     "",
 ]
 
+# operation entries that carry no per-call parameters, shared across all
+# make_operations calls (build stages copy each entry before mutating it)
+_PREAMBLE_OPS = (
+    { 'name': 'sat.preamble'        , 'sched_mode': SchedMode.PreSession, },
+    { 'name': 'start_time'          ,'sched_mode': SchedMode.PreSession},
+)
+_RELOCK_OPS = (
+    { 'name': 'sat.ufm_relock'      , 'sched_mode': SchedMode.PreSession, 'commands': commands_uxm_relock, },
+)
+_WIREGRID_OPS = (
+    { 'name': 'sat.wiregrid', 'sched_mode': SchedMode.Wiregrid },
+)
+
 def make_operations(
     az_speed, az_accel, iv_cadence=4*u.hour, bias_step_cadence=0.5*u.hour,
     disable_hwp=False, apply_boresight_rot=False, hwp_cfg=None,
     home_at_end=False, run_relock=False,
 ):
-    if hwp_cfg is None:
-        hwp_cfg = { 'iboot2': 'power-iboot-hwp-2', 'pid': 'hwp-pid', 'pmx': 'hwp-pmx', 'hwp-pmx': 'pmx', 'gripper': 'hwp-gripper',}
-
+    # hwp_cfg is accepted for backward compatibility but nothing in the
+    # operations below consumes it anymore, so no default dict is built
     pre_session_ops = [
-        { 'name': 'sat.preamble'        , 'sched_mode': SchedMode.PreSession, },
-        { 'name': 'start_time'          ,'sched_mode': SchedMode.PreSession},
+        *_PREAMBLE_OPS,
         { 'name': 'set_scan_params' , 'sched_mode': SchedMode.PreSession, 'az_speed': az_speed, 'az_accel': az_accel, },
     ]
     if run_relock:
-        pre_session_ops += [
-            { 'name': 'sat.ufm_relock'  , 'sched_mode': SchedMode.PreSession, 'commands': commands_uxm_relock, }
-        ]
+        pre_session_ops += _RELOCK_OPS
     cal_ops = [
         { 'name': 'sat.hwp_spin_up'     , 'sched_mode': SchedMode.PreCal, 'disable_hwp': disable_hwp,},
         { 'name': 'sat.det_setup'       , 'sched_mode': SchedMode.PreCal, 'commands': commands_det_setup, 'apply_boresight_rot': apply_boresight_rot, },
@@ -170,10 +171,7 @@ def make_operations(
     else:
         post_session_ops = []
 
-    wiregrid_ops = [
-        { 'name': 'sat.wiregrid', 'sched_mode': SchedMode.Wiregrid }
-    ]
-    return pre_session_ops + cal_ops + cmb_ops + post_session_ops + wiregrid_ops
+    return pre_session_ops + cal_ops + cmb_ops + post_session_ops + list(_WIREGRID_OPS)
 
 def make_config(
     master_file,
@@ -264,6 +262,24 @@ def make_config(
     }
     return config
 
+# interactive replanning tends to rebuild the same policy over and over:
+# memoize the config on its (hashable) inputs and hand out deep copies so
+# cached state is never shared with a live policy. cal_targets is kept out
+# of the key because it is a mutable list that callers grow afterwards;
+# it is spliced back in by the caller.
+@lru_cache(maxsize=16)
+def _make_config_cached(
+    master_file, state_file, az_speed, az_accel, iv_cadence,
+    bias_step_cadence, max_cmb_scan_duration, min_hwp_el, az_stow, el_stow,
+    boresight_override, hwp_override, az_motion_override, op_cfg_items,
+):
+    return make_config(
+        master_file, state_file, az_speed, az_accel,
+        iv_cadence, bias_step_cadence,
+        max_cmb_scan_duration, [], min_hwp_el,
+        az_stow, el_stow, boresight_override, hwp_override,
+        az_motion_override, **dict(op_cfg_items))
+
 
 # ----------------------------------------------------
 #
@@ -284,19 +300,35 @@ class SATP3Policy(SATPolicy):
         if cal_targets is None:
             cal_targets = []
 
-        x = cls(**make_config(
-            master_file, state_file, az_speed, az_accel,
-            iv_cadence, bias_step_cadence,
-            max_cmb_scan_duration, cal_targets, min_hwp_el,
-            az_stow, el_stow, boresight_override, hwp_override,
-            az_motion_override, **op_cfg)
-        )
+        try:
+            config = copy.deepcopy(_make_config_cached(
+                master_file, state_file, az_speed, az_accel,
+                iv_cadence, bias_step_cadence,
+                max_cmb_scan_duration, min_hwp_el,
+                az_stow, el_stow, boresight_override, hwp_override,
+                az_motion_override, tuple(sorted(op_cfg.items()))))
+        except TypeError:
+            # an op_cfg value is unhashable (e.g. a custom hwp_cfg dict):
+            # fall back to building the config directly
+            config = make_config(
+                master_file, state_file, az_speed, az_accel,
+                iv_cadence, bias_step_cadence,
+                max_cmb_scan_duration, [], min_hwp_el,
+                az_stow, el_stow, boresight_override, hwp_override,
+                az_motion_override, **op_cfg)
+        config['cal_targets'] = cal_targets
+        x = cls(**config)
         x.state_file = state_file
         return x
 
     def add_cal_target(self, *args, **kwargs):
         self.cal_targets.append(make_cal_target(*args, **kwargs))
 
+    def add_cal_targets(self, specs):
+        """bulk variant of add_cal_target: takes a list of keyword dicts
+        and extends cal_targets in one go"""
+        self.cal_targets.extend(make_cal_target(**spec) for spec in specs)
+
     def init_state(self, t0: dt.datetime) -> State:
         """customize typical initial state for satp3, if needed"""
         if self.state_file is not None:
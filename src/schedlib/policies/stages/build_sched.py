@@ -84,7 +84,8 @@ class BuildSched:
             state, dur, command = op(state)
 
             if indent:
-                command = [' '*indent+c for c in command]
+                pad = ' '*indent
+                command = [pad+c for c in command]
 
             duration += dur
             state = state.increment_time(dt.timedelta(seconds=dur))
@@ -1,3 +1,5 @@
+import bisect
+import copy
 import numpy as np
 import yaml
 import os.path as op
@@ -7,7 +9,7 @@ from dataclasses_json import dataclass_json
 import datetime as dt
 from typing import List, Union, Optional, Dict, Any, Tuple
 import jax.tree_util as tu
-from functools import reduce
+from functools import cached_property, reduce
 
 from .. import config as cfg, core, source as src, rules as ru
 from .. import commands as cmd, instrument as inst, utils as u
@@ -17,6 +19,11 @@ from .stages.build_op import get_parking
 
 logger = u.init_logger(__name__)
 
+# shared no-op command fragments: these branches are hit for a large
+# fraction of blocks, so reuse tuples instead of allocating a list per call
+_NO_COMMANDS = ()
+_NO_RELOCK = ("# no ufm relock needed at this time",)
+
 @dataclass_json
 @dataclass(frozen=True)
 class State(cmd.State):
@@ -80,7 +87,9 @@ class SchedMode:
     PreSession = 'pre_session'
     PostSession = 'post_session'
 
-@dataclass(frozen=True)
+# slots: instances are plentiful, read-only records on the planning hot
+# path, so skip the per-instance __dict__
+@dataclass(frozen=True, slots=True)
 class CalTarget:
     source: str
     array_query: str
@@ -93,49 +102,29 @@ class CalTarget:
     az_speed: Optional[float]= None
     az_accel: Optional[float] = None
 
+# only the toast master file varies between calls; keep the rest of the
+# nested dict as an import-time template and copy it on demand
+_BLOCKS_TEMPLATE = {
+    'baseline': {
+        'cmb': {
+            'type': 'toast',
+            'file': None
+        }
+    },
+    'calibration': {
+        name: {
+            'type' : 'source',
+            'name' : name,
+        }
+        for name in ('saturn', 'jupiter', 'moon', 'uranus', 'neptune',
+                     'mercury', 'venus', 'mars')
+    },
+}
+
 def make_blocks(master_file):
-    return {
-        'baseline': {
-            'cmb': {
-                'type': 'toast',
-                'file': master_file
-            }
-        },
-        'calibration': {
-            'saturn': {
-                'type' : 'source',
-                'name' : 'saturn',
-            },
-            'jupiter': {
-                'type' : 'source',
-                'name' : 'jupiter',
-            },
-            'moon': {
-                'type' : 'source',
-                'name' : 'moon',
-            },
-            'uranus': {
-                'type' : 'source',
-                'name' : 'uranus',
-            },
-            'neptune': {
-                'type' : 'source',
-                'name' : 'neptune',
-            },
-            'mercury': {
-                'type' : 'source',
-                'name' : 'mercury',
-            },
-            'venus': {
-                'type' : 'source',
-                'name' : 'venus',
-            },
-            'mars': {
-                'type' : 'source',
-                'name' : 'mars',
-            }
-        },
-    }
+    out = copy.deepcopy(_BLOCKS_TEMPLATE)
+    out['baseline']['cmb']['file'] = master_file
+    return out
 
 # ----------------------------------------------------
 #                Operation Helpers
@@ -143,21 +132,25 @@ def make_blocks(master_file):
 # Note that we are not registering here
 # These are helper functions for the LAT and SAT to use in there operations
 
+# static body of the schedule preamble, rendered once at import; preamble()
+# hands out a fresh list so callers remain free to append
+_PREAMBLE = (
+    "from nextline import disable_trace",
+    "import time",
+    "",
+    "with disable_trace():",
+    "    import numpy as np",
+    "    import sorunlib as run",
+    "    from ocs.ocs_client import OCSClient",
+    "    run.initialize()",
+    "",
+    "acu = run.CLIENTS['acu']",
+    "pysmurfs = run.CLIENTS['smurf']",
+    "",
+)
+
 def preamble():
-    return [
-        "from nextline import disable_trace",
-        "import time",
-        "",
-        "with disable_trace():",
-        "    import numpy as np",
-        "    import sorunlib as run",
-        "    from ocs.ocs_client import OCSClient",
-        "    run.initialize()",
-        "",
-        "acu = run.CLIENTS['acu']",
-        "pysmurfs = run.CLIENTS['smurf']",
-        "",
-        ]
+    return list(_PREAMBLE)
 
 def ufm_relock(state, commands=None):
     if state.last_ufm_relock is None:
@@ -184,7 +177,7 @@ def ufm_relock(state, commands=None):
         )
         return state, 15*u.minute, commands
     else:
-        return state, 0, ["# no ufm relock needed at this time"]
+        return state, 0, _NO_RELOCK
 
 def det_setup(state, block, commands=None, apply_boresight_rot=True, iv_cadence=None):
     # when should det setup be done?
@@ -241,7 +234,7 @@ def det_setup(state, block, commands=None, apply_boresight_rot=True, iv_cadence=
         )
         return state, 12*u.minute, commands
     else:
-        return state, 0, []
+        return state, 0, _NO_COMMANDS
 
 def cmb_scan(state, block):
     if (
@@ -288,20 +281,24 @@ def source_scan(state, block):
         commands = []
 
     state = state.replace(az_now=block.az, el_now=block.alt)
+    # isoformat/round are not cheap and these values appear twice below
+    t0_iso = block.t0.isoformat()
+    t1_iso = block.t1.isoformat()
+    drift5 = round(block.az_drift, 5)
     commands.extend([
         f"run.acu.move_to_target(az={round(block.az,3)}, el={round(block.alt,3)},",
-        f"    start_time='{block.t0.isoformat()}',",
-        f"    stop_time='{block.t1.isoformat()}',",
-        f"    drift={round(block.az_drift,5)})",
+        f"    start_time='{t0_iso}',",
+        f"    stop_time='{t1_iso}',",
+        f"    drift={drift5})",
         "",
         f"print('Waiting until {block.t0} to start scan')",
-        f"run.wait_until('{block.t0.isoformat()}')",
+        f"run.wait_until('{t0_iso}')",
         "",
         "run.seq.scan(",
         f"    description='{block.name}', ",
-        f"    stop_time='{block.t1.isoformat()}', ",
+        f"    stop_time='{t1_iso}', ",
         f"    width={round(block.throw,3)}, ",
-        f"    az_drift={round(block.az_drift,5)}, ",
+        f"    az_drift={drift5}, ",
         f"    subtype='{block.subtype}',",
         f"    tag='{block.tag}',",
         ")",
@@ -340,7 +337,7 @@ def bias_step(state, block, bias_step_cadence=None):
         )
         return state, 60, [ "run.smurf.bias_step(concurrent=True)", ]
     else:
-        return state, 0, []
+        return state, 0, _NO_COMMANDS
 
 @dataclass
 class TelPolicy:
@@ -389,6 +386,12 @@ class TelPolicy:
     operations: List[Dict[str, Any]] = field(default_factory=list)
     stages: Dict[str, Any] = field(default_factory=dict)
 
+    @cached_property
+    def _rule_names(self) -> frozenset:
+        """rule configs don't change after construction, so cache the key set
+        for the repeated membership checks in the policy passes"""
+        return frozenset(self.rules)
+
     def construct_seq(self, loader_cfg, t0, t1, columns):
         if loader_cfg['type'] == 'source':
             return src.source_gen_seq(loader_cfg['name'], t0, t1)
@@ -544,6 +547,10 @@ def round_robin(seqs_q, seqs_v=None, sun_avoidance=None, overlap_allowance=60*u.
     It supports an optional sun avoidance condition to filter out undesirable time blocks based on external criteria
     (for example, blocks that are in direct sunlight).
 
+    Sequences are expected to be sorted by start time, which allows accepted blocks that can no longer overlap any
+    future candidate to be pruned internally; unsorted sequences are detected at entry and still scheduled correctly,
+    just without that pruning.
+
     Examples
     --------
     >>> seqs_q = [[block1, block2], [block3]]
@@ -558,16 +565,41 @@ def round_robin(seqs_q, seqs_v=None, sun_avoidance=None, overlap_allowance=60*u.
     n_seq = len(seqs_q)
     seq_i = 0
     block_i = [0] * n_seq
+    seq_lens = [len(s) for s in seqs_q]  # avoid re-measuring every pass
+    # sequences are consumed one block at a time, so count exhaustions as
+    # they happen rather than re-scanning every sequence per pass
+    n_exhausted = sum(l == 0 for l in seq_lens)
+
+    merged = []     # accepted blocks, kept sorted by t0
+    merged_t0 = []  # parallel key list for bisect
+
+    # the frontier pruning below is only valid when every sequence yields
+    # blocks in time order; fall back to keeping all accepted blocks otherwise
+    prune = all(core.seq_is_sorted(s) for s in seqs_q)
+
+    # the sun check is deterministic per block and the same candidate can be
+    # examined more than once, so remember each verdict (blocks are frozen
+    # dataclasses and therefore hashable)
+    sun_ok_cache = {}
+    def sun_ok_fn(b):
+        ok = sun_ok_cache.get(b)
+        if ok is None:
+            ok = b == sun_avoidance(b)
+            sun_ok_cache[b] = ok
+        return ok
+
+    n_skipped = 0
 
-    merged = []
     while True:
         # return if we have exhausted all scans in all seqs
-        if all([block_i[i] >= len(seqs_q[i]) for i in range(n_seq)]):
+        if n_exhausted == n_seq:
+            if n_skipped > 0:
+                logger.info("-> Skipped %d blocks in total", n_skipped)
             return
 
         # cycle through seq -> add the latest non-overlaping block -> continue to next seq
         # skip if we have exhaused all scans in a sequence
-        if block_i[seq_i] >= len(seqs_q[seq_i]):
+        if block_i[seq_i] >= seq_lens[seq_i]:
             seq_i = (seq_i + 1) % n_seq
             continue
 
@@ -576,24 +608,67 @@ def round_robin(seqs_q, seqs_v=None, sun_avoidance=None, overlap_allowance=60*u.
         block_q = seq_q[block_i[seq_i]]
         block_v = seq_v[block_i[seq_i]]
 
+        # frontier sweep: with time-sorted sequences no future candidate can
+        # start before the earliest current candidate across all sequences.
+        # accepted blocks that end before that frontier can never overlap
+        # anything we will still examine, so drop them to keep the merged
+        # list short.
+        if prune:
+            frontier = min(
+                seqs_q[k][block_i[k]].t0
+                for k in range(n_seq) if block_i[k] < seq_lens[k]
+            )
+            n_stale = 0
+            while n_stale < len(merged) and merged[n_stale].t1 < frontier:
+                n_stale += 1
+            if n_stale:
+                del merged[:n_stale]
+                del merged_t0[:n_stale]
+
         # can we schedule this block?
         #  yes if:
         #  - it doesn't overlap with existing blocks
         #  - it satisfies sun avoidance condition if specified
-        overlap_ok = not core.seq_has_overlap_with_block(merged, block_q, allowance=overlap_allowance)
-        if not overlap_ok:
-            logger.info(f"-> Block {block_v} overlaps with existing block, skipping")
-
-        if sun_avoidance is not None:
-            sun_ok = block_q == sun_avoidance(block_q)
-            if not sun_ok:
-                logger.info(f"-> Block {block_v} fails sun check, skipping")
+        # merged is sorted and non-overlapping (up to the allowance), so
+        # instead of a linear scan only the blocks adjacent to the insertion
+        # point need to be checked
+        block_c = block_q
+        if overlap_allowance > 0:
+            block_c = block_c.shrink(dt.timedelta(seconds=2*overlap_allowance))
+        # %-style args so the repr of block_v is only built when a handler
+        # actually consumes the record
+        if block_c is None:
+            # shorter than twice the allowance: its overlap can never be
+            # assessed, and accepting it could leave merged blocks nested
+            # inside each other, breaking the neighbor-only test below
+            overlap_ok = False
+            logger.info("-> Block %s is shorter than twice the overlap allowance, skipping", block_v)
+        else:
+            i = bisect.bisect_left(merged_t0, block_c.t0)
+            overlap_ok = not (
+                (i > 0 and merged[i-1].t1 > block_c.t0) or
+                (i < len(merged) and merged[i].t0 < block_c.t1)
+            )
+            if not overlap_ok:
+                logger.info("-> Block %s overlaps with existing block, skipping", block_v)
+
+        # only pay for the sun check once the overlap test has passed
+        ok = overlap_ok
+        if ok and sun_avoidance is not None:
+            ok = sun_ok_fn(block_q)
+            if not ok:
+                logger.info("-> Block %s fails sun check, skipping", block_v)
+        if not ok:
+            n_skipped += 1
 
-        ok = overlap_ok * sun_ok
         if ok:
             # schedule and move on to next seq
             yield block_v
-            merged += [block_q]
+            i = bisect.bisect_left(merged_t0, block_q.t0)
+            merged.insert(i, block_q)
+            merged_t0.insert(i, block_q.t0)
             seq_i = (seq_i + 1) % n_seq
 
-        block_i[seq_i] += 1
\ No newline at end of file
+        block_i[seq_i] += 1
+        if block_i[seq_i] == seq_lens[seq_i]:
+            n_exhausted += 1
\ No newline at end of file
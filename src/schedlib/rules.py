@@ -338,6 +338,17 @@ class SunAvoidance(core.MappableRule):
         elif isinstance(block, src.SourceBlock):
             time_step = 60  # source is slow
 
+        # cheap pre-filter: the radial distance can never be smaller than
+        # the altitude difference, and the sun's altitude drifts by well
+        # under 0.5 deg per minute, so a minute-sampled altitude check
+        # (with a matching margin) certifies most blocks safe without the
+        # full per-second distance computation below
+        if time_step < 60:
+            t_c, _, alt_sun_c = sun_block.get_az_alt(time_step=60)
+            _, _, alt_scan_c = block.get_az_alt(ctimes=t_c)
+            if np.all(np.abs(alt_scan_c - alt_sun_c) > self.min_angle + 0.5):
+                return block
+
         # calculate distance to the Sun
         t, az_sun, alt_sun = sun_block.get_az_alt(time_step=time_step)
         _, az_scan, alt_scan = block.get_az_alt(ctimes=t)
@@ -371,10 +382,15 @@ class SunAvoidance(core.MappableRule):
 class MakeSourceScan(core.MappableRule):
     """convert observing window to actual scan blocks and allow for
     rephasing of the block. Applicable to only ObservingWindow blocks.
+
+    rng_keys optionally maps source names to dedicated keys, so a single
+    rule instance can cover all calibration sources in one traversal
+    instead of one rule (and one tree pass) per source.
     """
     rng_key: utils.PRNGKey
     preferred_length: Optional[float] = None  # seconds
     fixed_alt: Optional[float] = None
+    rng_keys: Optional[Dict[str, utils.PRNGKey]] = None
 
     def apply_block(self, block: core.Block) -> core.Block:
         if not isinstance(block, src.ObservingWindow): return block
@@ -384,7 +400,10 @@ class MakeSourceScan(core.MappableRule):
         if self.preferred_length is not None:
             preferred_len = min(self.preferred_length, duration)
             allowance = duration - preferred_len
-            offset = utils.uniform(self.rng_key, 0, allowance)
+            rng_key = self.rng_key
+            if self.rng_keys is not None:
+                rng_key = self.rng_keys.get(block.name, rng_key)
+            offset = utils.uniform(rng_key, 0, allowance)
             t0 = block.t0 + dt.timedelta(seconds=offset)
             scan = block.get_scan_at_t0(t0)
         elif self.fixed_alt is not None:
@@ -73,6 +73,10 @@ def get_source_list():
     s.update(FIXED_SOURCES)
     return s
 
+def is_source(name):
+    """membership check that doesn't build the merged source dict"""
+    return name in EPHEM_SOURCES or name in FIXED_SOURCES
+
 def add_fixed_source(name, ra, dec):
     name = name.lower()
     if name in EPHEM_SOURCES:
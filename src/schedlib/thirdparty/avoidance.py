@@ -87,12 +87,15 @@ class SunAvoidance(core.MappableRule):
             # Confirm alt is constant...
             alt = alt_min[0]
             assert np.all(alt == np.array([alt_max, alt_min]))
-            ok = np.zeros(len(t), bool)
-            for _i in range(len(t)):
-                az = np.linspace(az_left[_i], az_right[_i], 101)
-                j, i = sun._azel_pix(az, alt, dt=t[_i]-sun.base_time)
-                sun_time = sun.sun_times[j, i]
-                ok[_i] = (sun_time > self.min_sun_time).all()
+            # sample every minute's az throw on a common grid and look up
+            # the whole trajectory in one batched call instead of one
+            # projection call per minute
+            frac = np.linspace(0, 1, 101)
+            az = az_left[:, None] + (az_right - az_left)[:, None] * frac[None, :]
+            dt_grid = np.broadcast_to((t - sun.base_time)[:, None], az.shape)
+            j, i = sun._azel_pix(az.ravel(), np.full(az.size, alt), dt=dt_grid.ravel())
+            sun_time = sun.sun_times[j, i].reshape(az.shape)
+            ok = (sun_time > self.min_sun_time).all(axis=1)
         else:
             t, az, alt = block.get_az_alt(time_step=self.time_step)
             j, i = sun._azel_pix(az, alt, dt=t-sun.base_time)
@@ -2,7 +2,7 @@ from __future__ import annotations
 from datetime import datetime, timezone
 import pandas as pd
 import numpy as np
-from functools import reduce
+from functools import lru_cache, reduce
 from contextlib import contextmanager
 from scipy import interpolate
 from collections.abc import Iterable
@@ -161,8 +161,14 @@ def uniform(key: PRNGKey, low=0.0, high=1.0, size=None):
     with key.set_state():
         return np.random.uniform(low, high, size)
 
+@lru_cache(maxsize=None)
+def _daily_static_key(year, month, day):
+    return PRNGKey((year, month, day))
+
 def daily_static_key(t: datetime):
-    return PRNGKey((t.year, t.month, t.day))
+    # memoized per calendar date: repeated lookups on the same day share
+    # one key object, so the seeding in set_state only happens once
+    return _daily_static_key(t.year, t.month, t.day)
 
 def pprint(seq, **kwargs):
     """pretty print"""
@@ -207,6 +213,9 @@ def path2key(path, ignore_seqkey=False):
                 keys.append(p.idx)
         elif isinstance(p, DictKey):
             keys.append(p.key)
+        elif isinstance(p, (str, int)):
+            # optree paths carry the raw dict key / sequence index
+            keys.append(p)
         else:
             raise ValueError(f"unknown path type {type(p)}")
     return ".".join([str(k) for k in keys])
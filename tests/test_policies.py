@@ -1,8 +1,70 @@
-from schedlib import policies
+from schedlib import core, policies, instrument as inst
+from schedlib.policies import tel
 import datetime as dt
+import random
 
 minute = 60
 
+def test_round_robin_matches_reference():
+    # round_robin went through several optimizations (sorted merged list,
+    # neighbor-only overlap test, frontier pruning); pin its behavior against
+    # a straightforward check-everything reference on randomized sorted and
+    # unsorted sequences
+    allowance = 10*minute
+
+    def reference(seqs):
+        seq_i, block_i = 0, [0] * len(seqs)
+        merged, out = [], []
+        while not all(block_i[i] >= len(s) for i, s in enumerate(seqs)):
+            if block_i[seq_i] >= len(seqs[seq_i]):
+                seq_i = (seq_i + 1) % len(seqs)
+                continue
+            block = seqs[seq_i][block_i[seq_i]]
+            shrunk = block.shrink(dt.timedelta(seconds=2*allowance))
+            ok = shrunk is not None and not any(
+                core.block_overlap(shrunk, b) for b in merged)
+            if ok:
+                out.append(block)
+                merged.append(block)
+                seq_i = (seq_i + 1) % len(seqs)
+            block_i[seq_i] += 1
+        return out
+
+    t_ref = dt.datetime(2023, 1, 1, tzinfo=dt.timezone.utc)
+    def make_block(i, m0, m1):
+        return core.NamedBlock(
+            name=f'b{i}',
+            t0=t_ref + dt.timedelta(minutes=m0),
+            t1=t_ref + dt.timedelta(minutes=m1))
+
+    rng = random.Random(0)
+    for trial in range(100):
+        seqs = []
+        for _ in range(rng.randint(1, 4)):
+            ts = sorted(rng.sample(range(2000), 2*rng.randint(0, 8)))
+            seq = [make_block(i, ts[2*i], ts[2*i+1]) for i in range(len(ts)//2)]
+            if trial % 2:  # exercise the unsorted fallback path too
+                rng.shuffle(seq)
+            seqs.append(seq)
+        assert list(tel.round_robin(seqs, overlap_allowance=allowance)) \
+            == reference(seqs)
+
+def test_det_setup_not_repeated():
+    # det setup should only be emitted again when pointing actually changes
+    t0 = dt.datetime(2023, 1, 1, 0, 0, 0, tzinfo=dt.timezone.utc)
+    block = inst.ScanBlock(
+        name='cmb', t0=t0, t1=t0+dt.timedelta(minutes=10),
+        az=40, alt=50, throw=10, subtype='cmb', boresight_angle=0)
+    state = tel.State(curr_time=t0)
+    state, dur, cmds = tel.det_setup(state, block)
+    assert dur > 0 and len(cmds) > 0
+    # same elevation and boresight: no re-emission
+    state, dur, cmds = tel.det_setup(state, block)
+    assert dur == 0 and len(cmds) == 0
+    # a significant elevation change triggers setup again
+    state, dur, cmds = tel.det_setup(state, block.replace(alt=60))
+    assert dur > 0 and len(cmds) > 0
+
 def test_flex_policy():
     config = """
     blocks: